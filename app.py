@@ -8,6 +8,8 @@ import pandas as pd
 from nba_api.stats.static import players as nba_players
 from nba_api.stats.endpoints import playergamelog
 
+from scoring import score_one, series_for_stat
+
 
 # =========================
 # Config / Style
@@ -191,9 +193,6 @@ def fetch_last_games(player_id: int, season: str, n_games: int = 10) -> pd.DataF
 
     return df.head(n_games).reset_index(drop=True)
 
-def clamp(x, lo, hi):
-    return max(lo, min(hi, x))
-
 def compute_pickscore(
     df: pd.DataFrame,
     stat_label: str,
@@ -207,68 +206,27 @@ def compute_pickscore(
     - pick_score (0..100)
     - hit_rate (0..1)
     - volatility (std)
-    - recommendation (PLAY/PASS)
+    - recommendation (STRONG/PLAYABLE/PASS)
     - confidence (0..100)
+    - rec_mode (texto para la UI)
+
+    La fórmula vive en scoring.py (modelo "v1").
     """
     stat_key, _ = STAT_MAP[stat_label]
-
-    # Construir serie
-    if stat_label == "PRA":
-        if all(c in df.columns for c in ["PTS", "REB", "AST"]):
-            series = df["PTS"] + df["REB"] + df["AST"]
-        else:
-            series = None
-    else:
-        series = df[stat_key] if stat_key in df.columns else None
+    series = series_for_stat(df, "PRA" if stat_label == "PRA" else stat_key)
 
     if series is None:
        return 0.0, 0.0, 0.0, "PASS", 0, "NO JUGAR"
 
-    series = series.astype(float)
-    volatility = float(series.std(ddof=0)) if len(series) else 0.0
-
-    if direction == "MORE":
-        hits = (series > line_used).sum()
-    else:
-        hits = (series < line_used).sum()
-
-    n = len(series)
-    hit_rate = float(hits / n) if n else 0.0
-
-    # Score base
-    hits_score = 55 * hit_rate             # hasta 55 pts
-    vol_penalty = clamp(volatility, 0, 12) * 2.2  # hasta -26 aprox
-
-    # bonificaciones simples
-    role_bonus = {"Estrella": 6, "Titular normal": 3, "Jugador de rol": 0}.get(role, 0)
-    blow_penalty = {"Bajo": 0, "Medio": -3, "Alto": -8}.get(blowout, -3)
-
-    # Dirección: MORE suele ser “más estable”
-    dir_bonus = 2 if direction == "MORE" else 0
-
-    score = 35 + hits_score + role_bonus + blow_penalty + dir_bonus - vol_penalty
-    pick_score = float(clamp(score, 0, 100))
-
-    # Recomendación PRO (simple y clara)
-    # PLAY si score >= 60 y hit_rate >= 0.60 y volatilidad no muy alta
-        # Confianza
-    # base en score + castigo por volatilidad
-    confidence = int(clamp(pick_score - (volatility * 3), 0, 100))
-
-    # =========================
-    # Recomendación PRO (3 niveles)
-    # =========================
-    if pick_score >= 70 and confidence >= 60 and volatility <= 3.0:
-        recommendation = "STRONG"
-        rec_mode = "JUGAR (Power)"
-    elif pick_score >= 60 and confidence >= 50 and volatility <= 4.0:
-        recommendation = "PLAYABLE"
-        rec_mode = "FLEX (con cuidado)"
-    else:
-        recommendation = "PASS"
-        rec_mode = "NO JUGAR"
-
-    return pick_score, hit_rate, volatility, recommendation, confidence, rec_mode
+    r = score_one("v1", series, line_used, direction, role, blowout)
+    return (
+        float(r["pick_score"]),
+        float(r["hit_rate"]),
+        float(r["volatility"]),
+        str(r["recommendation"]),
+        int(r["confidence"]),
+        str(r["rec_mode"]),
+    )
 
 
 # =========================
@@ -343,7 +301,13 @@ st.subheader("3) Resultado")
 
 analyze = st.button("📊 Analizar", use_container_width=True)
 
+# El botón solo vale True en el rerun del click: se recuerda qué se analizó para
+# que el resultado (y el botón Guardar) sigan vivos hasta que cambie algún input.
+inputs = (player_name, stat_label, direction, season, int(n_games), use_auto, float(line_manual), role, blowout)
 if analyze:
+    st.session_state.analyzed_inputs = inputs
+
+if analyze or st.session_state.get("analyzed_inputs") == inputs:
     with st.spinner("Buscando jugador y trayendo últimos juegos..."):
         pid, full_name = find_player_id_by_name(player_name)
 
@@ -384,7 +348,7 @@ if analyze:
         )
 
     # Calcular score
-    pick_score, hit_rate, volatility, recommendation, confidence = compute_pickscore(
+    pick_score, hit_rate, volatility, recommendation, confidence, rec_mode = compute_pickscore(
         df=df,
         stat_label=stat_label,
         direction=direction,
@@ -397,14 +361,19 @@ if analyze:
 
     # Recomendación PRO
     st.markdown("🧠 **Recomendación PRO**")
-    if recommendation == "PLAY":
+    if recommendation == "STRONG":
+        st.markdown(
+            f"<div class='good'>✅ <b>STRONG</b><br/>Modo sugerido: <b>{rec_mode}</b><br/>Confianza: <b>{confidence}%</b></div>",
+            unsafe_allow_html=True
+        )
+    elif recommendation == "PLAYABLE":
         st.markdown(
-            f"<div class='good'>✅ <b>PLAY</b><br/>Modo sugerido: <b>JUGAR</b><br/>Confianza: <b>{confidence}%</b></div>",
+            f"<div class='pill'>⚠️ <b>PLAYABLE</b><br/>Modo sugerido: <b>{rec_mode}</b><br/>Confianza: <b>{confidence}%</b></div>",
             unsafe_allow_html=True
         )
     else:
         st.markdown(
-            f"<div class='bad'>❌ <b>PASS</b><br/>Modo sugerido: <b>NO JUGAR</b><br/>Confianza: <b>{confidence}%</b></div>",
+            f"<div class='bad'>❌ <b>PASS</b><br/>Modo sugerido: <b>{rec_mode}</b><br/>Confianza: <b>{confidence}%</b></div>",
             unsafe_allow_html=True
         )
 
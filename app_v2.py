@@ -7,6 +7,9 @@ from datetime import datetime
 from nba_api.stats.static import players as nba_players
 from nba_api.stats.endpoints import playergamelog
 
+from headshots import HeadshotCache, headshot_url
+from scoring import score_one
+
 # -----------------------------
 # CONFIG + ESTILO
 # -----------------------------
@@ -88,9 +91,6 @@ STAT_OPTIONS = {
     "PRA (Pts+Reb+Ast)": "PRA",
 }
 
-def headshot_url(player_id: int) -> str:
-    return f"https://cdn.nba.com/headshots/nba/latest/260x190/{player_id}.png"
-
 @st.cache_data(ttl=60*60, show_spinner=False)
 def get_active_players():
     plist = [p for p in nba_players.get_players() if p.get("is_active")]
@@ -99,6 +99,16 @@ def get_active_players():
     id_to_name = {p["id"]: p["full_name"] for p in plist}
     return plist, name_to_id, id_to_name
 
+@st.cache_resource(show_spinner=False)
+def get_headshot_cache():
+    # una sola instancia por proceso: compartida entre sesiones y reruns
+    cache = HeadshotCache()
+    # PICKSCORE_HEADSHOT_PREFETCH=0 desactiva la precarga del roster (p.ej. en loadtest.py)
+    if os.environ.get("PICKSCORE_HEADSHOT_PREFETCH", "1") != "0":
+        plist, _, _ = get_active_players()
+        cache.prefetch([p["id"] for p in plist])
+    return cache
+
 @st.cache_data(ttl=60*10, show_spinner=False)
 def fetch_last_games(player_id: int, season: str, n_games: int) -> pd.DataFrame:
     gl = playergamelog.PlayerGameLog(player_id=player_id, season=season)
@@ -172,7 +182,8 @@ cA, cB = st.columns([1, 1])
 with cA:
     player_name = st.selectbox("Jugador", filtered_names, index=0)
     player_id = name_to_id[player_name]
-    st.image(headshot_url(player_id), caption=player_name, use_container_width=True)
+    headshot = get_headshot_cache().get(player_id)
+    st.image(headshot or headshot_url(player_id), caption=player_name, use_container_width=True)
 
 with cB:
     stat_label = st.selectbox("Stat", list(STAT_OPTIONS.keys()), index=0)
@@ -199,7 +210,15 @@ line_manual = st.number_input("Línea manual (si quieres)", min_value=0.0, value
 # -----------------------------
 st.subheader("3) Resultado")
 
-if st.button("📊 Analizar", use_container_width=True, type="secondary"):
+analyze = st.button("📊 Analizar", use_container_width=True, type="secondary")
+
+# El botón solo vale True en el rerun del click: se recuerda qué se analizó para
+# que el resultado (y el botón Guardar) sigan vivos hasta que cambie algún input.
+inputs = (player_name, stat_label, direction, season, int(n_games), use_auto, float(line_manual))
+if analyze:
+    st.session_state.analyzed_inputs = inputs
+
+if analyze or st.session_state.get("analyzed_inputs") == inputs:
     with st.spinner("Buscando jugador y trayendo últimos juegos..."):
         df = fetch_last_games(player_id, season, n_games)
 
@@ -229,18 +248,12 @@ if st.button("📊 Analizar", use_container_width=True, type="secondary"):
     st.caption(f"📌 Línea usada para el cálculo: **{line:.2f}** ({'AUTO' if use_auto else 'MANUAL'})")
 
     # Probabilidad simple (no “garantía”): % de juegos que cumplió vs línea
-    if direction == "MORE":
-        hits = (df[stat_key] > line).sum()
-    else:
-        hits = (df[stat_key] < line).sum()
-
-    hit_rate = hits / len(df) if len(df) else 0
-
-    # “PickScore” simple: mezcla hit_rate + estabilidad (desv)
-    std = float(df[stat_key].std()) if len(df) > 1 else 0.0
-    stability = max(0.0, 1.0 - (std / (line + 1e-6)))  # heurística
-    pick_score = (0.7 * hit_rate + 0.3 * stability) * 100
-    pick_score = max(0, min(100, pick_score))
+    # “PickScore” simple: mezcla hit_rate + estabilidad (desv) -> scoring.py, modelo "v2"
+    r = score_one("v2", df[stat_key], line, direction)
+    hits = int(r["hits"])
+    hit_rate = float(r["hit_rate"])
+    std = float(r["volatility"])
+    pick_score = float(r["pick_score"])
 
     st.markdown(f"### PickScore: **{pick_score:.1f}/100**")
     st.markdown(f"- Hit rate últimos {n_games}: **{hit_rate*100:.1f}%** ({hits}/{len(df)})")
@@ -270,5 +283,6 @@ if st.button("📊 Analizar", use_container_width=True, type="secondary"):
         st.session_state.history.append(item)
         save_history(st.session_state.history)
         st.success("Listo: guardado en tu historial ✅")
+        st.rerun()  # refresca la tabla del historial de arriba
 
 st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,192 @@
+"""
+Chequeo de headshots.HeadshotCache contra un servidor de imágenes local.
+
+Levanta un http.server en 127.0.0.1 que sirve PNGs generados para
+/<player_id>.png (y 404 para los ids en `missing`), y verifica miss, hit,
+fallo, deduplicación de descargas y evicción en disco/memoria.
+
+    python check_headshots.py
+
+El mismo servidor lo usa loadtest.py para que las corridas no toquen cdn.nba.com.
+"""
+
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from headshots import Image, HeadshotCache
+
+
+# =========================
+# Servidor stub
+# =========================
+def make_png(width: int, height: int, seed: int = 0) -> bytes:
+    """PNG RGB válido sin depender de Pillow."""
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    color = bytes([(seed * 37) % 256, (seed * 91) % 256, (seed * 53) % 256])
+    rows = b"".join(b"\x00" + color * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+class StubImageServer:
+    """Servidor de headshots falso; cuenta los requests por path."""
+
+    def __init__(self, size=(260, 190), delay: float = 0.0, missing=()):
+        self.size = size
+        self.delay = float(delay)
+        self.missing = {int(m) for m in missing}
+        self.hits = {}
+        self._lock = threading.Lock()
+        self._httpd = None
+
+    @property
+    def url_template(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/{{player_id}}.png"
+
+    def requests_for(self, player_id: int) -> int:
+        with self._lock:
+            return self.hits.get(f"/{int(player_id)}.png", 0)
+
+    def start(self) -> "StubImageServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.hits[self.path] = stub.hits.get(self.path, 0) + 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+                m = re.fullmatch(r"/(\d+)\.png", self.path)
+                if not m or int(m.group(1)) in stub.missing:
+                    self.send_error(404)
+                    return
+                body = make_png(*stub.size, seed=int(m.group(1)))
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+# =========================
+# Chequeos
+# =========================
+def _cache(stub: StubImageServer, tmp: str, **kwargs) -> HeadshotCache:
+    return HeadshotCache(
+        cache_dir=os.path.join(tmp, "cache"),
+        url_for=lambda pid: stub.url_template.format(player_id=pid),
+        **kwargs,
+    )
+
+def check_miss_then_hit(stub, tmp):
+    cache = _cache(stub, tmp)
+    t0 = time.perf_counter()
+    assert cache.get(1000) is None, "un miss debe devolver None"
+    assert time.perf_counter() - t0 < 0.1, "un miss no debe esperar la descarga"
+
+    assert cache.wait(5)
+    data = cache.get(1000)
+    assert data, "después de la descarga de fondo debe haber bytes"
+    if Image is not None:
+        assert data[:4] == b"RIFF" and data[8:12] == b"WEBP", "la variante en disco debe ser WebP"
+
+    assert cache.get(1000) is data, "el segundo get debe salir de memoria"
+    assert stub.requests_for(1000) == 1
+
+    # una instancia nueva (otro proceso / reinicio) lee de disco sin red
+    assert _cache(stub, tmp).get(1000) == data
+    assert stub.requests_for(1000) == 1
+
+def check_no_duplicate_downloads(stub, tmp):
+    stub.delay = 0.2  # que el get llegue con la descarga del prefetch en vuelo
+    cache = _cache(stub, tmp)
+    cache.prefetch([2000, 2001, 2002])
+    for _ in range(5):
+        cache.get(2000)
+    assert cache.wait(5)
+    assert stub.requests_for(2000) == 1, f"/2000.png pedido {stub.requests_for(2000)} veces"
+    assert cache.get(2000) and cache.get(2002)
+
+def check_failure_is_remembered(stub, tmp):
+    cache = _cache(stub, tmp, retry_after=60)
+    assert cache.get(404) is None
+    assert cache.wait(5)
+    assert cache.get(404) is None
+    assert cache.wait(5)
+    assert stub.requests_for(404) == 1, "un fallo no debe reintentarse antes de retry_after"
+    assert not os.listdir(os.path.join(tmp, "cache")), "no se debe cachear un fallo"
+
+def check_disk_and_memory_eviction(stub, tmp):
+    cache = _cache(stub, tmp)
+    cache.get(3000)
+    assert cache.wait(5)
+    one = len(cache.get(3000))
+
+    small = _cache(stub, tmp, max_disk_bytes=one * 3, max_memory_bytes=one * 2)
+    for pid in range(3001, 3006):
+        small.get(pid)
+        assert small.wait(5)
+        time.sleep(0.01)  # mtimes distintos para el LRU
+        assert small.get(pid)
+
+    files = os.listdir(small.cache_dir)
+    total = sum(os.path.getsize(os.path.join(small.cache_dir, f)) for f in files)
+    assert total <= one * 3, f"disco {total} > límite {one * 3}"
+    assert any(f.startswith("3005_") for f in files), "lo más reciente debe seguir en disco"
+    assert not any(f.startswith("3000_") for f in files), "lo más viejo debe salir del disco"
+    assert small._mem_bytes <= one * 2 and len(small._mem) == 2
+
+CHECKS = [
+    check_miss_then_hit,
+    check_no_duplicate_downloads,
+    check_failure_is_remembered,
+    check_disk_and_memory_eviction,
+]
+
+def main() -> int:
+    failed = 0
+    for check in CHECKS:
+        with tempfile.TemporaryDirectory() as tmp, StubImageServer(missing=[404]) as stub:
+            try:
+                check(stub, tmp)
+                print(f"ok    {check.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"FALLO {check.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Chequeo de paridad de scoring.py contra las fórmulas escalares originales.
+
+Copia las fórmulas de app.py (compute_pickscore) y app_v2.py tal como
+estaban antes del registro de modelos, y compara score_one("v1"/"v2") y
+score_all sobre casos aleatorios (incluye series vacías, de un juego, con
+NaN y todo NaN). También verifica la alineación ventana/objetivo/línea de
+backtest_batch contra un loop explícito.
+
+    python check_scoring.py
+"""
+
+import math
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+
+from scoring import backtest_batch, build_batch, score_all, score_one
+
+
+# =========================
+# Fórmulas originales (referencia)
+# =========================
+def clamp(x, lo, hi):
+    return max(lo, min(hi, x))
+
+def old_v1(series: pd.Series, direction: str, line_used: float, role: str, blowout: str):
+    series = series.astype(float)
+    volatility = float(series.std(ddof=0)) if len(series) else 0.0
+
+    if direction == "MORE":
+        hits = (series > line_used).sum()
+    else:
+        hits = (series < line_used).sum()
+
+    n = len(series)
+    hit_rate = float(hits / n) if n else 0.0
+
+    hits_score = 55 * hit_rate
+    vol_penalty = clamp(volatility, 0, 12) * 2.2
+    role_bonus = {"Estrella": 6, "Titular normal": 3, "Jugador de rol": 0}.get(role, 0)
+    blow_penalty = {"Bajo": 0, "Medio": -3, "Alto": -8}.get(blowout, -3)
+    dir_bonus = 2 if direction == "MORE" else 0
+
+    score = 35 + hits_score + role_bonus + blow_penalty + dir_bonus - vol_penalty
+    pick_score = float(clamp(score, 0, 100))
+    confidence = int(clamp(pick_score - (volatility * 3), 0, 100))
+
+    if pick_score >= 70 and confidence >= 60 and volatility <= 3.0:
+        recommendation, rec_mode = "STRONG", "JUGAR (Power)"
+    elif pick_score >= 60 and confidence >= 50 and volatility <= 4.0:
+        recommendation, rec_mode = "PLAYABLE", "FLEX (con cuidado)"
+    else:
+        recommendation, rec_mode = "PASS", "NO JUGAR"
+
+    return pick_score, hit_rate, volatility, recommendation, confidence, rec_mode
+
+def old_v2(series: pd.Series, direction: str, line: float):
+    df = pd.DataFrame({"STAT": series})
+    if direction == "MORE":
+        hits = (df["STAT"] > line).sum()
+    else:
+        hits = (df["STAT"] < line).sum()
+    hit_rate = hits / len(df) if len(df) else 0
+
+    std = float(df["STAT"].std()) if len(df) > 1 else 0.0
+    stability = max(0.0, 1.0 - (std / (line + 1e-6)))
+    pick_score = (0.7 * hit_rate + 0.3 * stability) * 100
+    pick_score = max(0, min(100, pick_score))
+
+    return pick_score, hit_rate, int(hits), std
+
+
+# =========================
+# Casos
+# =========================
+ROLES = ["Estrella", "Titular normal", "Jugador de rol", ""]
+BLOWOUTS = ["Bajo", "Medio", "Alto", ""]
+
+def random_case(rng: random.Random):
+    n = rng.choice([0, 1, 2, 3, 5, 10, 15, 20])
+    scale = rng.choice([1, 3, 8, 25])
+    values = [float(rng.randint(0, 4 * scale)) for _ in range(n)]
+    if n and rng.random() < 0.3:  # huecos: juegos sin stat
+        for i in rng.sample(range(n), rng.randint(1, n)):
+            values[i] = np.nan
+    line = rng.choice([0.5, 1.5]) + rng.randint(0, 3 * scale)
+    return pd.Series(values, dtype=float), line, rng.choice(["MORE", "LESS"]), rng.choice(ROLES), rng.choice(BLOWOUTS)
+
+def same(a, b) -> bool:
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    a, b = float(a), float(b)
+    return (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+# =========================
+# Chequeos
+# =========================
+def check_v1_matches_app(cases):
+    for series, line, direction, role, blowout in cases:
+        old = old_v1(series, direction, line, role, blowout)
+        r = score_one("v1", series, line, direction, role, blowout)
+        new = (r["pick_score"], r["hit_rate"], r["volatility"], r["recommendation"], r["confidence"], r["rec_mode"])
+        assert all(same(a, b) for a, b in zip(old, new)), f"v1 {list(series)} {line} {direction}: {old} != {new}"
+
+def check_v2_matches_app_v2(cases):
+    for series, line, direction, _, _ in cases:
+        old = old_v2(series, direction, line)
+        r = score_one("v2", series, line, direction)
+        new = (r["pick_score"], r["hit_rate"], r["hits"], r["volatility"])
+        assert all(same(a, b) for a, b in zip(old, new)), f"v2 {list(series)} {line} {direction}: {old} != {new}"
+
+def check_batch_matches_one_by_one(cases):
+    # el relleno de las series cortas no debe contar como juego
+    batch = build_batch(
+        [c[0] for c in cases], [c[1] for c in cases], [c[2] for c in cases],
+        [c[3] for c in cases], [c[4] for c in cases],
+    )
+    df = score_all(batch)
+    for i, (series, line, direction, role, blowout) in enumerate(cases):
+        for model in ("v1", "v2"):
+            one = score_one(model, series, line, direction, role, blowout)
+            for field, value in one.items():
+                assert same(df[(model, field)].iloc[i], value), f"{model}.{field} fila {i}"
+
+def check_backtest_alignment(_cases):
+    rng = random.Random(3)
+    season = [float(rng.randint(5, 40)) for _ in range(30)]
+    for n_games in (1, 5, 10, 29, 30):
+        for direction in ("MORE", "LESS"):
+            batch, hit = backtest_batch(season, n_games, direction)
+            expected = len(season) - n_games if len(season) > n_games else 0
+            assert len(batch) == expected == len(hit), f"n={n_games}: {len(batch)} picks"
+            for i in range(expected):
+                # pick del juego i: se decide con los n_games anteriores (i+1 .. i+n_games)
+                window = season[i + 1 : i + 1 + n_games]
+                assert list(batch.values[i]) == window, f"n={n_games} ventana {i}"
+                assert same(batch.lines[i], sum(window) / n_games), f"n={n_games} línea {i}"
+                target = season[i]
+                want = target > batch.lines[i] if direction == "MORE" else target < batch.lines[i]
+                assert bool(hit[i]) == want, f"n={n_games} acierto {i}"
+            if expected:
+                score_all(batch)  # todos los modelos corren sobre el backtest
+
+CHECKS = [
+    check_v1_matches_app,
+    check_v2_matches_app_v2,
+    check_batch_matches_one_by_one,
+    check_backtest_alignment,
+]
+
+def main() -> int:
+    rng = random.Random(11)
+    cases = [random_case(rng) for _ in range(1000)]
+    cases += [
+        (pd.Series([], dtype=float), 10.5, "MORE", "Estrella", "Bajo"),
+        (pd.Series([np.nan], dtype=float), 10.5, "LESS", "", ""),
+        (pd.Series([np.nan, np.nan], dtype=float), 10.5, "MORE", "Estrella", "Alto"),
+        (pd.Series([12.0, np.nan], dtype=float), 10.5, "MORE", "Titular normal", "Medio"),
+    ]
+
+    failed = 0
+    for check in CHECKS:
+        try:
+            check(cases)
+            print(f"ok    {check.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FALLO {check.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Cache local de headshots de la NBA.
+
+Baja cada imagen de cdn.nba.com una sola vez, guarda variantes redimensionadas
+(WebP si Pillow está disponible) en disco con límite de tamaño LRU, y sirve
+los bytes desde memoria. Las descargas nunca bloquean un rerun: get() devuelve
+None si la imagen no está en memoria ni en disco y la encola para los hilos
+de fondo (la UI cae a la URL del CDN mientras tanto). El roster activo se
+puede precargar con prefetch().
+
+La URL base es configurable (PICKSCORE_HEADSHOT_URL) para apuntar a un
+servidor local de prueba, p.ej.:
+    PICKSCORE_HEADSHOT_URL="http://127.0.0.1:8000/{player_id}.png"
+Ver check_headshots.py.
+"""
+
+import io
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:  # sin Pillow se guarda el PNG original tal cual
+    Image = None
+
+
+HEADSHOT_URL = "https://cdn.nba.com/headshots/nba/latest/260x190/{player_id}.png"
+DEFAULT_SIZE = (260, 190)
+
+def headshot_url(player_id: int) -> str:
+    template = os.environ.get("PICKSCORE_HEADSHOT_URL") or HEADSHOT_URL
+    return template.format(player_id=int(player_id))
+
+
+class HeadshotCache:
+    """
+    get(player_id) -> bytes | None
+
+    Orden de búsqueda: memoria (LRU por bytes) -> disco (LRU por mtime).
+    Si no está, se encola la descarga y se devuelve None. Los fallos de
+    descarga se recuerdan `retry_after` segundos para no reintentar en cada
+    rerun.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".headshot_cache",
+        max_disk_bytes: int = 200 * 2**20,
+        max_memory_bytes: int = 32 * 2**20,
+        timeout: float = 5.0,
+        retry_after: float = 300.0,
+        workers: int = 4,
+        url_for=headshot_url,
+    ):
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.timeout = float(timeout)
+        self.retry_after = float(retry_after)
+        self.workers = int(workers)
+        self.url_for = url_for
+
+        self._mem = OrderedDict()  # (player_id, size) -> bytes
+        self._mem_bytes = 0
+        self._failed = {}          # player_id -> timestamp del último fallo
+        self._lock = threading.Lock()
+
+        # cola única de descargas: la UI entra por delante, el prefetch por detrás
+        self._queue = deque()
+        self._queued = set()       # claves en cola o descargándose
+        self._cond = threading.Condition(self._lock)
+        self._threads = []
+        self._local = threading.local()  # un requests.Session por hilo
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # total en disco: se escanea una vez y después se lleva la cuenta
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = self._scan_disk()[1]
+
+    # -------------------------
+    # API pública
+    # -------------------------
+    def get(self, player_id: int, size: tuple = DEFAULT_SIZE):
+        key = (int(player_id), tuple(size))
+
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+                return data
+
+        data = self._read_disk(key)
+        if data is not None:
+            self._remember(key, data)
+            return data
+
+        self._enqueue([key], urgent=True)
+        return None
+
+    def prefetch(self, player_ids, size: tuple = DEFAULT_SIZE) -> None:
+        """Encola (a disco) los ids que aún no estén cacheados."""
+        keys = [(int(pid), tuple(size)) for pid in player_ids]
+        self._enqueue([k for k in keys if not os.path.exists(self._variant_path(k))], urgent=False)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Espera a que la cola de descargas se vacíe (útil en pruebas)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queued:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # -------------------------
+    # Cola de descargas
+    # -------------------------
+    def _enqueue(self, keys, urgent: bool) -> None:
+        with self._cond:
+            now = time.time()
+            for key in keys:
+                if key in self._queued:
+                    continue
+                failed_at = self._failed.get(key[0])
+                if failed_at is not None and now - failed_at < self.retry_after:
+                    continue
+                self._queued.add(key)
+                if urgent:
+                    self._queue.appendleft(key)
+                else:
+                    self._queue.append(key)
+            self._start_workers()
+            self._cond.notify_all()
+
+    def _start_workers(self) -> None:
+        # llamado con el lock tomado; los hilos se crean la primera vez que hay trabajo
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._worker, name="headshot-fetch", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                key = self._queue.popleft()
+            try:
+                self._fetch(key)
+            finally:
+                with self._cond:
+                    self._queued.discard(key)
+                    self._cond.notify_all()
+
+    def _fetch(self, key) -> None:
+        if os.path.exists(self._variant_path(key)):
+            return
+        raw = self._download(key[0])
+        if raw is None:
+            return
+        data = self._encode(raw, key[1])
+        if data is None:
+            self._mark_failed(key[0])
+            return
+        self._write(self._variant_path(key), data)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    # -------------------------
+    # Disco
+    # -------------------------
+    def _variant_path(self, key) -> str:
+        player_id, size = key
+        ext = "webp" if Image is not None else "png"
+        return os.path.join(self.cache_dir, f"{player_id}_{size[0]}x{size[1]}.{ext}")
+
+    def _read_disk(self, key):
+        path = self._variant_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # marca de uso para el LRU en disco
+            return data
+        except OSError:
+            return None
+
+    def _write(self, path: str, data: bytes) -> None:
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            with self._disk_lock:
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp, path)
+                self._disk_bytes += len(data) - old_size
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _scan_disk(self):
+        """(entradas (mtime, tamaño, path), total en bytes) del directorio."""
+        entries = []
+        try:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".tmp"):
+                    continue
+                p = os.path.join(self.cache_dir, name)
+                try:
+                    st_ = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st_.st_mtime, st_.st_size, p))
+        except OSError:
+            pass
+        return entries, sum(e[1] for e in entries)
+
+    def _evict_disk(self) -> None:
+        # solo corre pasado el límite; el escaneo también corrige la cuenta en
+        # memoria si otro proceso tocó el directorio
+        with self._disk_lock:
+            entries, total = self._scan_disk()
+            for _, size, p in sorted(entries):
+                if total <= self.max_disk_bytes:
+                    break
+                try:
+                    os.remove(p)
+                    total -= size
+                except OSError:
+                    pass
+            self._disk_bytes = total
+
+    # -------------------------
+    # Memoria
+    # -------------------------
+    def _remember(self, key, data: bytes) -> None:
+        if len(data) > self.max_memory_bytes:
+            return
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self._mem_bytes -= len(old)
+            self._mem[key] = data
+            self._mem_bytes += len(data)
+            while self._mem_bytes > self.max_memory_bytes:
+                _, evicted = self._mem.popitem(last=False)
+                self._mem_bytes -= len(evicted)
+
+    # -------------------------
+    # Red / imagen
+    # -------------------------
+    def _mark_failed(self, player_id: int) -> None:
+        with self._lock:
+            self._failed[player_id] = time.time()
+
+    def _http(self) -> requests.Session:
+        # requests.Session no es thread-safe: cada worker usa la suya
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _download(self, player_id: int):
+        try:
+            r = self._http().get(self.url_for(player_id), timeout=self.timeout)
+            r.raise_for_status()
+            return r.content
+        except requests.RequestException:
+            self._mark_failed(player_id)
+            return None
+
+    def _encode(self, raw: bytes, size: tuple):
+        """Bytes listos para guardar, o None si la imagen no se pudo decodificar."""
+        if Image is None:
+            return raw
+        try:
+            with Image.open(io.BytesIO(raw)) as img:
+                img = img.convert("RGBA")
+                if img.size != tuple(size):
+                    img = img.resize(tuple(size), Image.LANCZOS)
+                out = io.BytesIO()
+                img.save(out, format="WEBP", quality=85, method=4)
+                return out.getvalue()
+        except Exception:
+            return None
@@ -0,0 +1,702 @@
+"""
+Harness de carga para app.py / app_v2.py.
+
+Levanta una réplica real (`streamlit run`, un proceso) y la maneja con N
+clientes websocket headless concurrentes, que hablan el mismo protocolo que
+el navegador (BackMsg / ForwardMsg por /_stcore/stream). Así todas las
+sesiones comparten el proceso, el GIL y los st.cache_data/st.cache_resource
+del servidor, igual que en producción.
+
+El servidor corre con nba_api repetido desde un fixture JSON (o game logs
+sintéticos si no hay fixture) y con los headshots de app_v2 servidos por un
+servidor stub local (sin precarga del roster salvo --prefetch-headshots).
+
+Cada sesión hace el flujo típico: buscar -> seleccionar jugador/stat ->
+Analizar -> Guardar, y verifica el resultado de cada paso (la app aceptó el
+valor, PickScore visible, la tabla del historial creció). Un paso fallido
+corta ese flujo, se reporta aparte y no entra en los percentiles; si hay
+alguno el script sale con código 1.
+
+Reporta throughput (reruns/s), percentiles de latencia por rerun, CPU del
+servidor y crecimiento de memoria (RSS del servidor) por sesión.
+
+Uso:
+    python loadtest.py --app app_v2.py --sessions 20 --flows 3
+    python loadtest.py --app app.py --sessions 50 --think 2 --api-latency 0.4
+    python loadtest.py --record nba_fixture.json --players "LeBron James" "Stephen Curry"
+
+Con --think 0 (default) las sesiones no esperan entre pasos: mide saturación.
+Con un think time realista mide la latencia que ve cada usuario con N usuarios.
+La memoria por sesión se mide en Linux (/proc); en otros sistemas sale 0.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+import requests
+import websockets
+
+from nba_api.stats.static import players as nba_players
+from nba_api.stats.endpoints import playergamelog
+
+from check_headshots import StubImageServer
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GAMELOG_COLUMNS = ["GAME_DATE", "MATCHUP", "PTS", "REB", "AST"]
+NAME_SUFFIXES = {"jr.", "sr.", "ii", "iii", "iv", "v"}
+
+
+# =========================
+# Replay de nba_api
+# =========================
+def _fixture_key(player_id, season) -> str:
+    return f"{int(player_id)}|{season}"
+
+def load_fixture(path: str) -> dict:
+    if not path:
+        return {"players": None, "gamelogs": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {"players": data.get("players"), "gamelogs": data.get("gamelogs", {})}
+
+def synthetic_gamelog(player_id: int, season: str, n: int = 30) -> list:
+    # determinístico por jugador/temporada para que las corridas sean comparables
+    rng = random.Random(_fixture_key(player_id, season))
+    pts_avg = rng.uniform(6, 30)
+    reb_avg = rng.uniform(2, 12)
+    ast_avg = rng.uniform(1, 9)
+    start = date(2025, 10, 21)
+    rows = []
+    for i in range(n):
+        d = start + timedelta(days=2 * i)
+        rows.append({
+            "GAME_DATE": d.strftime("%b %d, %Y").upper(),
+            "MATCHUP": f"AAA {'vs.' if i % 2 else '@'} BBB",
+            "PTS": max(0, int(rng.gauss(pts_avg, pts_avg * 0.3))),
+            "REB": max(0, int(rng.gauss(reb_avg, reb_avg * 0.35))),
+            "AST": max(0, int(rng.gauss(ast_avg, ast_avg * 0.4))),
+        })
+    return rows
+
+class ReplayNBA:
+    """Reemplaza las llamadas de nba_api que usan las apps por datos locales."""
+
+    def __init__(self, fixture: dict, api_latency: float = 0.0, calls_file: str = ""):
+        self.fixture = fixture
+        self.api_latency = float(api_latency)
+        self.calls_file = calls_file  # el servidor corre en otro proceso: así se reportan las llamadas
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._saved = {}
+
+    def get_players(self):
+        if self.fixture["players"] is not None:
+            return list(self.fixture["players"])
+        return self._saved["get_players"]()
+
+    def find_players_by_full_name(self, name: str):
+        nlow = (name or "").lower()
+        return [p for p in self.get_players() if nlow in p["full_name"].lower()]
+
+    def gamelog_factory(self):
+        replay = self
+
+        class PlayerGameLog:
+            def __init__(self, player_id, season, **kwargs):
+                with replay._lock:
+                    replay.calls += 1
+                    if replay.calls_file:
+                        with open(replay.calls_file, "w") as f:
+                            f.write(str(replay.calls))
+                if replay.api_latency:
+                    time.sleep(replay.api_latency)
+                rows = replay.fixture["gamelogs"].get(_fixture_key(player_id, season))
+                if rows is None:
+                    rows = synthetic_gamelog(player_id, season)
+                self._df = pd.DataFrame(rows)
+
+            def get_data_frames(self):
+                return [self._df.copy()]
+
+        return PlayerGameLog
+
+    def __enter__(self):
+        self._saved = {
+            "get_players": nba_players.get_players,
+            "find_players_by_full_name": nba_players.find_players_by_full_name,
+            "PlayerGameLog": playergamelog.PlayerGameLog,
+        }
+        nba_players.get_players = self.get_players
+        nba_players.find_players_by_full_name = self.find_players_by_full_name
+        playergamelog.PlayerGameLog = self.gamelog_factory()
+        return self
+
+    def __exit__(self, *exc):
+        nba_players.get_players = self._saved["get_players"]
+        nba_players.find_players_by_full_name = self._saved["find_players_by_full_name"]
+        playergamelog.PlayerGameLog = self._saved["PlayerGameLog"]
+        return False
+
+def record_fixture(path: str, names: list, season: str) -> None:
+    """Baja los game logs reales (stats.nba.com) y los guarda para replay."""
+    players = [p for p in nba_players.get_players() if p.get("is_active")]
+    gamelogs = {}
+    for name in names:
+        matches = nba_players.find_players_by_full_name(name)
+        if not matches:
+            print(f"sin coincidencias: {name}", file=sys.stderr)
+            continue
+        pid = int(matches[0]["id"])
+        df = playergamelog.PlayerGameLog(player_id=pid, season=season).get_data_frames()[0]
+        cols = [c for c in GAMELOG_COLUMNS if c in df.columns]
+        gamelogs[_fixture_key(pid, season)] = df[cols].to_dict(orient="records")
+        time.sleep(0.6)  # no martillar stats.nba.com
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"players": players, "gamelogs": gamelogs}, f, ensure_ascii=False)
+    print(f"fixture guardado: {path} ({len(gamelogs)} game logs)")
+
+
+
+def search_terms(fixture: dict, seed: int, k: int = 40) -> list:
+    """Apellidos de jugadores activos reales (con su ortografía, p.ej. 'dončić')."""
+    if fixture["players"] is not None:
+        plist = fixture["players"]
+    else:
+        plist = nba_players.get_players()
+    terms = []
+    for p in plist:
+        if not p.get("is_active", True):
+            continue
+        parts = [t for t in p["full_name"].lower().split() if t not in NAME_SUFFIXES]
+        if parts:
+            terms.append(parts[-1])
+    terms = sorted(set(terms))
+    random.Random(seed).shuffle(terms)
+    return terms[:k]
+
+
+# =========================
+# Servidor (una réplica)
+# =========================
+def serve(app_path: str, port: int, fixture_path: str, api_latency: float, calls_file: str) -> None:
+    """Modo --serve: `streamlit run` en este proceso, con nba_api repetido."""
+    from streamlit.web import cli as st_cli
+
+    replay = ReplayNBA(load_fixture(fixture_path), api_latency, calls_file)
+    replay.__enter__()  # queda parchado mientras viva el servidor
+    sys.argv = [
+        "streamlit", "run", app_path,
+        "--server.port", str(port),
+        "--server.address", "127.0.0.1",
+        "--server.headless", "true",
+        "--server.fileWatcherType", "none",
+        "--server.enableXsrfProtection", "false",
+        "--browser.gatherUsageStats", "false",
+        "--logger.level", "error",
+    ]
+    st_cli.main()
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(app_path: str, workdir: str, fixture_path: str, api_latency: float, env: dict):
+    port = _free_port()
+    calls_file = os.path.join(workdir, "nba_api_calls")
+    log = open(os.path.join(workdir, "server.log"), "w")
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "--serve", app_path,
+        "--port", str(port), "--api-latency", str(api_latency), "--calls-file", calls_file,
+    ]
+    if fixture_path:
+        cmd += ["--fixture", os.path.abspath(fixture_path)]
+    # cwd aparte: las apps escriben pick_history.json y .headshot_cache en el cwd
+    proc = subprocess.Popen(cmd, cwd=workdir, env=dict(os.environ, **env), stdout=log, stderr=subprocess.STDOUT)
+    return proc, port, calls_file
+
+def wait_ready(proc, port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"el servidor terminó al arrancar (código {proc.returncode})")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"el servidor no respondió en {timeout:.0f}s")
+
+def rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def cpu_seconds(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+def _read_calls(calls_file: str) -> int:
+    try:
+        with open(calls_file, "r") as f:
+            return int(f.read() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+# =========================
+# Cliente headless (protocolo del navegador)
+# =========================
+class StepFailed(Exception):
+    pass
+
+class AppClient:
+    """
+    Una pestaña del navegador: una sesión websocket con la réplica.
+    Guarda los elementos del último run y los valores de widgets que el
+    usuario cambió, y los reenvía en cada rerun como hace el frontend.
+    """
+
+    def __init__(self, port: int, timeout: float):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.http = f"http://127.0.0.1:{port}"
+        self.timeout = timeout
+        self.ws = None
+        self.elements = {}  # delta_path -> (tipo, proto)
+        self.values = {}    # widget id -> (campo de WidgetState, valor)
+
+    async def connect(self) -> None:
+        self.ws = await websockets.connect(
+            self.url, subprotocols=["streamlit"], max_size=None, open_timeout=self.timeout,
+        )
+
+    async def close(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, trigger_id: str = "") -> None:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        cs = msg.rerun_script
+        cs.query_string = ""
+        cs.page_script_hash = ""
+        for wid, (field, value) in self.values.items():
+            ws_ = cs.widget_states.widgets.add()
+            ws_.id = wid
+            setattr(ws_, field, value)
+        if trigger_id:
+            ws_ = cs.widget_states.widgets.add()
+            ws_.id = trigger_id
+            ws_.trigger_value = True
+
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._read_run(), self.timeout)
+
+        # como el navegador: solo se conservan los widgets que siguen en pantalla
+        live = {getattr(p, "id", "") for _, p in self.elements.values()}
+        self.values = {k: v for k, v in self.values.items() if k in live}
+
+    async def _read_run(self) -> None:
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        self.elements = {}
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await self.ws.recv())
+            kind = fm.WhichOneof("type")
+            if kind == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                el = fm.delta.new_element
+                etype = el.WhichOneof("type")
+                self.elements[tuple(fm.metadata.delta_path)] = (etype, getattr(el, etype))
+            elif kind == "script_finished":
+                if fm.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    self.elements = {}  # st.rerun(): viene otro run completo
+                    continue
+                if fm.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+                    raise StepFailed(f"script_finished={fm.script_finished}")
+                return
+
+    # ---- lectura del último run ----
+    def find(self, etype: str, label_prefix: str):
+        for t, p in self.elements.values():
+            if t == etype and (p.label or "").startswith(label_prefix):
+                return p
+        return None
+
+    def require(self, etype: str, label_prefix: str):
+        p = self.find(etype, label_prefix)
+        if p is None:
+            raise StepFailed(f"no está el widget '{label_prefix}'")
+        return p
+
+    def exception(self):
+        for t, p in self.elements.values():
+            if t == "exception":
+                return f"{p.type}: {p.message}"
+        return None
+
+    def markdown_contains(self, text: str) -> bool:
+        return any(t == "markdown" and text in p.body for t, p in self.elements.values())
+
+    def history_rows(self) -> int:
+        """Filas de la tabla del historial (el dataframe con columna 'ts')."""
+        import pyarrow as pa
+
+        for t, p in self.elements.values():
+            if t == "dataframe" and p.arrow_data.data:
+                table = pa.ipc.open_stream(io.BytesIO(p.arrow_data.data)).read_all()
+                if "ts" in table.column_names:
+                    return table.num_rows
+        return 0
+
+    def image_urls(self) -> list:
+        return [img.url for t, p in self.elements.values() if t == "imgs" for img in p.imgs]
+
+    # ---- acciones del usuario (preparan el próximo rerun) ----
+    def set_text(self, label_prefix: str, value: str) -> None:
+        self.values[self.require("text_input", label_prefix).id] = ("string_value", value)
+
+    def select(self, label_prefix: str, option: str) -> None:
+        self.values[self.require("selectbox", label_prefix).id] = ("string_value", option)
+
+    def button_id(self, label_prefix: str) -> str:
+        return self.require("button", label_prefix).id
+
+
+class SessionStats:
+    def __init__(self):
+        self.latencies = {}  # paso -> [segundos], solo pasos exitosos
+        self.errors = {}     # paso -> {motivo: count}
+
+    def ok(self, step: str, seconds: float) -> None:
+        self.latencies.setdefault(step, []).append(seconds)
+
+    def fail(self, step: str, reason: str) -> None:
+        reasons = self.errors.setdefault(step, {})
+        reasons[reason] = reasons.get(reason, 0) + 1
+
+async def _step(stats: SessionStats, step: str, client: AppClient, interact, check) -> bool:
+    """
+    interact() prepara el cambio (y devuelve el id de botón a disparar, si hay),
+    el rerun es lo que se mide y check() verifica el resultado (None = ok).
+    """
+    try:
+        trigger = interact() or ""
+    except StepFailed as e:
+        stats.fail(step, str(e))
+        return False
+
+    t0 = time.perf_counter()
+    try:
+        await client.rerun(trigger)
+    except asyncio.TimeoutError:
+        stats.fail(step, f"timeout ({client.timeout:.0f}s)")
+        return False
+    except (StepFailed, websockets.WebSocketException, OSError) as e:
+        stats.fail(step, f"rerun falló: {type(e).__name__}: {e}"[:120])
+        return False
+    elapsed = time.perf_counter() - t0
+
+    exc = client.exception()
+    if exc:
+        stats.fail(step, f"excepción en la app: {exc}"[:120])
+        return False
+    reason = check()
+    if reason:
+        stats.fail(step, reason)
+        return False
+
+    stats.ok(step, elapsed)
+    return True
+
+async def _fetch_images(stats: SessionStats, client: AppClient) -> None:
+    # lo que el navegador pide aparte después de renderizar (headshot de app_v2)
+    for url in client.image_urls():
+        if url.startswith("http"):
+            continue  # fallback directo al CDN: no pasa por la réplica
+        t0 = time.perf_counter()
+        try:
+            r = await asyncio.to_thread(requests.get, client.http + url, timeout=client.timeout)
+            r.raise_for_status()
+            stats.ok("imagen", time.perf_counter() - t0)
+        except requests.RequestException as e:
+            stats.fail("imagen", f"{type(e).__name__}")
+
+async def run_session(port: int, flows: int, searches: list, seed: int, timeout: float,
+                      think: float, stats: SessionStats, client: AppClient) -> None:
+    rng = random.Random(seed)
+
+    async def pause():
+        if think:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+    try:
+        await client.connect()
+    except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+        stats.fail("carga", f"no conectó: {type(e).__name__}")
+        return
+
+    if not await _step(stats, "carga", client, lambda: None,
+                       lambda: None if client.find("button", "📊 Analizar") else "la app no terminó de renderizar"):
+        return
+    await _fetch_images(stats, client)
+
+    for _ in range(flows):
+        await pause()
+        search = rng.choice(searches)
+        ok = await _step(stats, "buscar", client, lambda: client.set_text("Buscar jugador", search),
+                         lambda: None if client.find("selectbox", "Jugador") and client.find("selectbox", "Jugador").options
+                         else "selectbox 'Jugador' vacío")
+        if not ok:
+            continue
+
+        await pause()
+        options = list(client.find("selectbox", "Jugador").options)
+        choice = rng.choice(options)
+
+        def check_selected(label, value):
+            p = client.find("selectbox", label)
+            if p is None:
+                return f"desapareció '{label}'"
+            if p.set_value and p.raw_value != value:
+                return f"la app rechazó '{value}' en '{label}'"
+            return None
+
+        if not await _step(stats, "seleccionar", client, lambda: client.select("Jugador", choice),
+                           lambda: check_selected("Jugador", choice)):
+            continue
+        await _fetch_images(stats, client)
+
+        await pause()
+        stat = client.find("selectbox", "Stat")
+        stat_choice = rng.choice(list(stat.options)) if stat is not None and stat.options else ""
+        if not await _step(stats, "stat", client, lambda: client.select("Stat", stat_choice),
+                           lambda: check_selected("Stat", stat_choice)):
+            continue
+
+        await pause()
+        if not await _step(stats, "analizar", client, lambda: client.button_id("📊 Analizar"),
+                           lambda: None if client.markdown_contains("PickScore:") else "no apareció el PickScore"):
+            continue
+
+        await pause()
+        before = client.history_rows()
+        await _step(stats, "guardar", client, lambda: client.button_id("💾 Guardar"),
+                    lambda: None if client.history_rows() > before else "el historial no creció (pick no guardado)")
+
+
+# =========================
+# Métricas
+# =========================
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    # nearest-rank
+    k = max(0, min(len(s) - 1, math.ceil(q / 100 * len(s)) - 1))
+    return s[k]
+
+def summarize(vals: list) -> dict:
+    return {
+        "reruns": len(vals),
+        "p50_ms": round(percentile(vals, 50) * 1000, 1),
+        "p90_ms": round(percentile(vals, 90) * 1000, 1),
+        "p99_ms": round(percentile(vals, 99) * 1000, 1),
+        "max_ms": round(max(vals) * 1000, 1) if vals else 0.0,
+    }
+
+def build_report(all_stats: list, wall: float, sessions: int, mem_before: int, mem_after: int,
+                 cpu_s: float, api_calls: int) -> dict:
+    by_step = {}
+    errors = {}
+    for st_ in all_stats:
+        for step, vals in st_.latencies.items():
+            by_step.setdefault(step, []).extend(vals)
+        for step, reasons in st_.errors.items():
+            step_errors = errors.setdefault(step, {})
+            for reason, n in reasons.items():
+                step_errors[reason] = step_errors.get(reason, 0) + n
+
+    steps = {}
+    for step in list(by_step) + [s for s in errors if s not in by_step]:
+        n_err = sum(errors.get(step, {}).values())
+        steps[step] = dict(summarize(by_step.get(step, [])), errors=n_err, error_reasons=errors.get(step, {}))
+
+    # "imagen" son requests HTTP, no reruns
+    reruns = [v for step, vals in by_step.items() if step != "imagen" for v in vals]
+    n_errors = sum(s["errors"] for s in steps.values())
+    n_ok = sum(len(v) for v in by_step.values())
+
+    return {
+        "sessions": sessions,
+        "wall_s": round(wall, 2),
+        "throughput_reruns_s": round(len(reruns) / wall, 2) if wall else 0.0,
+        "server_cpu_s": round(cpu_s, 2),
+        "server_cpu_pct": round(100 * cpu_s / wall, 1) if wall else 0.0,
+        "api_calls": api_calls,
+        "total": dict(summarize(reruns), errors=n_errors),
+        "error_rate": round(n_errors / (n_ok + n_errors), 4) if (n_ok or n_errors) else 0.0,
+        "steps": steps,
+        "rss_before_mb": round(mem_before / 2**20, 1),
+        "rss_after_mb": round(mem_after / 2**20, 1),
+        "mem_per_session_kb": round(max(mem_after - mem_before, 0) / max(sessions, 1) / 1024, 1),
+    }
+
+def print_report(report: dict) -> None:
+    print(f"\nSesiones: {report['sessions']}  •  Tiempo: {report['wall_s']}s  •  "
+          f"Throughput: {report['throughput_reruns_s']} reruns/s  •  "
+          f"CPU servidor: {report['server_cpu_s']}s ({report['server_cpu_pct']}%)  •  "
+          f"Llamadas nba_api: {report['api_calls']}")
+    print(f"{'paso':<12}{'ok':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errores':>9}")
+    for step, s in list(report["steps"].items()) + [("TOTAL reruns", report["total"])]:
+        print(f"{step:<12}{s['reruns']:>8}{s['p50_ms']:>10}{s['p90_ms']:>10}{s['p99_ms']:>10}"
+              f"{s['max_ms']:>10}{s['errors']:>9}")
+    print(f"RSS servidor: {report['rss_before_mb']} MB -> {report['rss_after_mb']} MB  "
+          f"(≈ {report['mem_per_session_kb']} KB por sesión)")
+
+    if report["total"]["errors"]:
+        print(f"\n!!! ATENCIÓN: {report['total']['errors']} pasos fallaron "
+              f"({report['error_rate'] * 100:.1f}%). Las latencias solo cuentan los exitosos:",
+              file=sys.stderr)
+        for step, s in report["steps"].items():
+            for reason, n in s["error_reasons"].items():
+                print(f"    {step:<12} x{n:<4} {reason}", file=sys.stderr)
+
+
+# =========================
+# Main
+# =========================
+async def _drive(port: int, sessions: int, flows: int, searches: list, seed: int, timeout: float,
+                 think: float, pid: int):
+    # calentamiento: imports, cache de jugadores y primer game log fuera de la medición
+    warm = AppClient(port, timeout)
+    await run_session(port, 1, searches, seed - 1, timeout, 0.0, SessionStats(), warm)
+    await warm.close()
+    await asyncio.sleep(0.5)
+    mem_before = rss_bytes(pid)
+    cpu_before = cpu_seconds(pid)
+
+    clients = [AppClient(port, timeout) for _ in range(sessions)]
+    all_stats = [SessionStats() for _ in range(sessions)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        run_session(port, flows, searches, seed + i, timeout, think, all_stats[i], clients[i])
+        for i in range(sessions)
+    ])
+    wall = time.perf_counter() - t0
+
+    # con todas las sesiones todavía abiertas
+    mem_after = rss_bytes(pid)
+    cpu_s = cpu_seconds(pid) - cpu_before
+    await asyncio.gather(*[c.close() for c in clients], return_exceptions=True)
+    return all_stats, wall, mem_before, mem_after, cpu_s
+
+def run_load(app_path: str, sessions: int, flows: int, fixture_path: str, api_latency: float,
+             timeout: float, seed: int, think: float = 0.0, prefetch_headshots: bool = False) -> dict:
+    app_path = os.path.abspath(app_path)
+    searches = search_terms(load_fixture(fixture_path), seed)
+
+    # headshots de app_v2 desde un servidor local: nada de cdn.nba.com en la medición
+    with tempfile.TemporaryDirectory() as workdir, StubImageServer() as stub:
+        env = {
+            "PICKSCORE_HEADSHOT_URL": stub.url_template,
+            "PICKSCORE_HEADSHOT_PREFETCH": "1" if prefetch_headshots else "0",
+        }
+        proc, port, calls_file = start_server(app_path, workdir, fixture_path, api_latency, env)
+        try:
+            wait_ready(proc, port, timeout=60)
+            calls_before = _read_calls(calls_file)
+            all_stats, wall, mem_before, mem_after, cpu_s = asyncio.run(
+                _drive(port, sessions, flows, searches, seed, timeout, think, proc.pid)
+            )
+            api_calls = _read_calls(calls_file) - calls_before
+        except Exception:
+            with open(os.path.join(workdir, "server.log"), "r", errors="replace") as f:
+                print(f.read()[-3000:], file=sys.stderr)
+            raise
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    return build_report(all_stats, wall, sessions, mem_before, mem_after, cpu_s, api_calls)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Prueba de carga para las apps de PickScore")
+    ap.add_argument("--app", default="app_v2.py", help="script de Streamlit a probar")
+    ap.add_argument("--sessions", type=int, default=10, help="sesiones concurrentes (clientes websocket)")
+    ap.add_argument("--flows", type=int, default=3, help="flujos buscar→Analizar→Guardar por sesión")
+    ap.add_argument("--think", type=float, default=0.0, help="pausa media entre pasos de un usuario (s)")
+    ap.add_argument("--fixture", default="", help="JSON con datos de nba_api grabados (--record)")
+    ap.add_argument("--api-latency", type=float, default=0.0, help="latencia simulada de stats.nba.com (s)")
+    ap.add_argument("--timeout", type=float, default=30.0, help="timeout por rerun (s)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--prefetch-headshots", action="store_true",
+                    help="dejar que app_v2 precargue el roster (desde el servidor stub)")
+    ap.add_argument("--json", default="", help="guardar el reporte en este archivo")
+    ap.add_argument("--record", default="", help="grabar fixture en este archivo y salir")
+    ap.add_argument("--players", nargs="*", default=["LeBron James", "Stephen Curry", "Nikola Jokic"])
+    ap.add_argument("--season", default="2025-26")
+    # uso interno: el proceso del servidor
+    ap.add_argument("--serve", default="", help=argparse.SUPPRESS)
+    ap.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    ap.add_argument("--calls-file", default="", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.port, args.fixture, args.api_latency, args.calls_file)
+        return 0
+
+    if args.record:
+        record_fixture(args.record, args.players, args.season)
+        return 0
+
+    report = run_load(
+        app_path=args.app if os.path.exists(args.app) else os.path.join(BASE_DIR, args.app),
+        sessions=max(1, args.sessions),
+        flows=max(0, args.flows),
+        fixture_path=args.fixture,
+        api_latency=args.api_latency,
+        timeout=args.timeout,
+        seed=args.seed,
+        think=max(0.0, args.think),
+        prefetch_headshots=args.prefetch_headshots,
+    )
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    # cualquier fallo invalida los números para capacity planning
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Registro de modelos de PickScore.
+
+Cada modelo es un kernel vectorizado: recibe un SeriesBatch (matriz de stats
+picks x juegos, más líneas/dirección/contexto) y las features comunes ya
+calculadas, y devuelve arrays por pick. Así se pueden correr todos los modelos
+lado a lado sobre un slate o una temporada de backtest en una sola pasada,
+sin volver a traer ni preprocesar los game logs.
+
+    batch = build_batch([s1, s2], lines=[24.5, 7.5], directions=["MORE", "LESS"])
+    df = score_all(batch)          # columnas (modelo, campo)
+    df["v1"]["pick_score"]
+
+    batch, acerto = backtest_batch(season_pts, n_games=10)
+    score_all(batch)  # todos los modelos sobre toda la temporada
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# Batch de series
+# =========================
+class SeriesBatch:
+    """
+    values: (n_picks, n_games) float, relleno con NaN después de `lengths`.
+    lengths: largo real de cada serie. Un NaN dentro de ese largo cuenta como
+    juego sin acierto (como en las apps: hits / len(serie)); el relleno no.
+    Las series van del juego más reciente al más viejo (como las apps).
+    """
+
+    def __init__(self, values, lengths, lines, more, roles, blowouts):
+        self.values = values
+        self.lengths = lengths
+        self.lines = lines
+        self.more = more
+        self.roles = roles
+        self.blowouts = blowouts
+
+    def __len__(self):
+        return self.values.shape[0]
+
+def series_for_stat(df: pd.DataFrame, stat_key: str):
+    """Serie de un game log para PTS/REB/AST o PRA; None si faltan columnas."""
+    if stat_key == "PRA":
+        if all(c in df.columns for c in ["PTS", "REB", "AST"]):
+            return df["PTS"] + df["REB"] + df["AST"]
+        return None
+    return df[stat_key] if stat_key in df.columns else None
+
+def build_batch(series_list, lines, directions, roles=None, blowouts=None, max_games=None) -> SeriesBatch:
+    n = len(series_list)
+    arrays = [
+        np.asarray([] if s is None else s, dtype=float)[:max_games] for s in series_list
+    ]
+    width = max((len(a) for a in arrays), default=0)
+
+    values = np.full((n, width), np.nan)
+    for i, a in enumerate(arrays):
+        values[i, :len(a)] = a
+
+    return SeriesBatch(
+        values=values,
+        lengths=np.asarray([len(a) for a in arrays], dtype=int),
+        lines=np.asarray(lines, dtype=float).reshape(n),
+        more=np.asarray([d == "MORE" for d in directions], dtype=bool).reshape(n),
+        roles=np.asarray(roles if roles is not None else [""] * n, dtype=object),
+        blowouts=np.asarray(blowouts if blowouts is not None else [""] * n, dtype=object),
+    )
+
+def backtest_batch(series, n_games: int, direction: str = "MORE", role: str = "", blowout: str = ""):
+    """
+    Una temporada -> un pick por juego: la ventana son los `n_games` juegos
+    anteriores y la línea es su promedio (línea PRO automática).
+    Devuelve (batch, acertó) con acertó[i] = el juego real superó/quedó bajo la línea.
+    """
+    s = np.asarray(series, dtype=float)
+    if len(s) <= n_games:
+        return build_batch([], [], []), np.zeros(0, dtype=bool)
+
+    windows = np.lib.stride_tricks.sliding_window_view(s[1:], n_games)[: len(s) - n_games]
+    targets = s[: len(windows)]
+    lines = windows.mean(axis=1)
+    k = len(windows)
+
+    batch = SeriesBatch(
+        values=windows.copy(),
+        lengths=np.full(k, n_games),
+        lines=lines,
+        more=np.full(k, direction == "MORE"),
+        roles=np.full(k, role, dtype=object),
+        blowouts=np.full(k, blowout, dtype=object),
+    )
+    hit = targets > lines if direction == "MORE" else targets < lines
+    return batch, hit
+
+
+# =========================
+# Features comunes
+# =========================
+def compute_features(batch: SeriesBatch) -> dict:
+    """
+    Todo lo que comparten los modelos; se calcula una vez por batch.
+
+    Misma semántica que las fórmulas escalares de las apps: el hit rate se
+    divide por el largo real de la serie (un NaN es un juego sin acierto) y
+    las desviaciones son las de pandas (ignoran NaN; NaN si no alcanzan los
+    valores, 0 si la serie está vacía).
+    """
+    X = batch.values
+    n = batch.lengths
+    valid = ~np.isnan(X)
+    n_valid = valid.sum(axis=1)
+    nan_std = np.full(len(batch), np.nan)
+
+    L = batch.lines[:, None]
+    with np.errstate(invalid="ignore"):
+        hit_mask = np.where(batch.more[:, None], X > L, X < L) & valid
+    hits = hit_mask.sum(axis=1)
+    hit_rate = np.divide(hits, n, out=np.zeros(len(batch)), where=n > 0)
+
+    filled = np.where(valid, X, 0.0)
+    total = filled.sum(axis=1)
+    mean = np.divide(total, n_valid, out=np.zeros(len(batch)), where=n_valid > 0)
+    sq_dev = (np.where(valid, X - mean[:, None], 0.0) ** 2).sum(axis=1)
+
+    # app.py: series.std(ddof=0) si hay juegos, si no 0
+    std0 = np.sqrt(np.divide(sq_dev, n_valid, out=nan_std.copy(), where=n_valid > 0))
+    std0[n == 0] = 0.0
+    # app_v2.py: df.std() (ddof=1) si hay más de un juego, si no 0
+    std1 = np.sqrt(np.divide(sq_dev, n_valid - 1, out=nan_std.copy(), where=n_valid > 1))
+    std1[n <= 1] = 0.0
+
+    return {
+        "n": n,
+        "hits": hits,
+        "hit_rate": hit_rate,
+        "mean": mean,
+        "std0": std0,  # ddof=0 (app.py)
+        "std1": std1,  # ddof=1 (pandas default, app_v2.py)
+    }
+
+
+# =========================
+# Registro
+# =========================
+MODELS = {}
+
+def register_model(name: str):
+    def deco(fn):
+        MODELS[name] = fn
+        return fn
+    return deco
+
+def score_all(batch: SeriesBatch, models=None) -> pd.DataFrame:
+    """Corre los modelos pedidos (todos por defecto) sobre el mismo batch."""
+    names = list(models) if models is not None else list(MODELS)
+    unknown = [m for m in names if m not in MODELS]
+    if unknown:
+        raise KeyError(f"Modelo(s) no registrado(s): {', '.join(unknown)}")
+
+    feats = compute_features(batch)
+    out = {}
+    for name in names:
+        for field, arr in MODELS[name](batch, feats).items():
+            out[(name, field)] = arr
+    return pd.DataFrame(out)
+
+def score_one(model: str, series, line: float, direction: str, role: str = "", blowout: str = "") -> dict:
+    """Atajo para la UI: un solo pick, devuelve escalares."""
+    batch = build_batch([series], [line], [direction], [role], [blowout])
+    row = score_all(batch, [model])[model].iloc[0]
+    return row.to_dict()
+
+
+# =========================
+# Modelos
+# =========================
+ROLE_BONUS = {"Estrella": 6, "Titular normal": 3, "Jugador de rol": 0}
+BLOWOUT_PENALTY = {"Bajo": 0, "Medio": -3, "Alto": -8}
+
+def _clamp(x, lo, hi):
+    # como max(lo, min(hi, x)) de app.py: con NaN queda en hi
+    return np.where(np.isnan(x), hi, np.clip(x, lo, hi))
+
+@register_model("v1")
+def pickscore_v1(batch: SeriesBatch, f: dict) -> dict:
+    """app.py: 35 + 55·hit_rate − volatilidad + bonus de rol/blowout/dirección."""
+    vol = f["std0"]
+    role_bonus = np.array([ROLE_BONUS.get(r, 0) for r in batch.roles], dtype=float)
+    blow_penalty = np.array([BLOWOUT_PENALTY.get(b, -3) for b in batch.blowouts], dtype=float)
+    dir_bonus = np.where(batch.more, 2.0, 0.0)  # MORE suele ser “más estable”
+
+    # hasta 55 pts por hit rate, hasta -26 aprox por volatilidad
+    score = 35 + 55 * f["hit_rate"] + role_bonus + blow_penalty + dir_bonus - _clamp(vol, 0, 12) * 2.2
+    pick_score = _clamp(score, 0, 100)
+    confidence = _clamp(pick_score - vol * 3, 0, 100).astype(int)
+
+    strong = (pick_score >= 70) & (confidence >= 60) & (vol <= 3.0)
+    playable = (pick_score >= 60) & (confidence >= 50) & (vol <= 4.0)
+    recommendation = np.where(strong, "STRONG", np.where(playable, "PLAYABLE", "PASS"))
+    rec_mode = np.where(strong, "JUGAR (Power)", np.where(playable, "FLEX (con cuidado)", "NO JUGAR"))
+
+    return {
+        "pick_score": pick_score,
+        "hit_rate": f["hit_rate"],
+        "volatility": vol,
+        "recommendation": recommendation,
+        "confidence": confidence,
+        "rec_mode": rec_mode,
+    }
+
+@register_model("v2")
+def pickscore_v2(batch: SeriesBatch, f: dict) -> dict:
+    """app_v2.py: 0.7·hit_rate + 0.3·estabilidad (1 − std/línea)."""
+    std = f["std1"]
+    stability = np.fmax(0.0, 1.0 - std / (batch.lines + 1e-6))  # max(0.0, NaN) == 0.0
+    score = (0.7 * f["hit_rate"] + 0.3 * stability) * 100
+    pick_score = np.clip(score, 0, 100)
+
+    return {
+        "pick_score": pick_score,
+        "hit_rate": f["hit_rate"],
+        "hits": f["hits"],
+        "volatility": std,
+        "stability": stability,
+    }